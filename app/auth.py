@@ -1,19 +1,30 @@
 # app/auth.py
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+import jwt
+from jwt import PyJWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
-from app.database import get_db
+from app.database import get_async_db
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Заголовок ответа 401 для схемы Bearer
+BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+# Ключ подписи JWT в байтах: не перекодируется при каждом encode/decode
+JWT_KEY = settings.SECRET_KEY.encode()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Проверка пароля"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -36,40 +47,59 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
         to_encode, 
-        settings.SECRET_KEY, 
+        JWT_KEY, 
         algorithm=settings.ALGORITHM
     )
     
     return encoded_jwt
 
+def credentials_exception() -> HTTPException:
+    """
+    Ошибка 401 для невалидного токена.
+    
+    Создаётся только при ошибке: общий экземпляр исключения нельзя поднимать
+    повторно — при каждом raise к его __traceback__ добавляются кадры, а
+    запросы обрабатываются конкурентно.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers=BEARER_CHALLENGE,
+    )
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> models.User:
     """Получение текущего пользователя из токена"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
+            JWT_KEY, 
             algorithms=[settings.ALGORITHM]
         )
-        user_id: int = payload.get("sub")
-        
-        if user_id is None:
-            raise credentials_exception
-            
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        
-        if user is None or not user.is_active:
-            raise credentials_exception
-            
-        return user
-        
-    except JWTError:
-        raise credentials_exception
\ No newline at end of file
+    except PyJWTError:
+        raise credentials_exception()
+    
+    user_id = payload.get("sub")
+    
+    # asyncpg не приводит типы параметров сам: id в токене хранится строкой
+    if user_id is None or not str(user_id).isdigit():
+        raise credentials_exception()
+    
+    user = await db.get(models.User, int(user_id))
+    
+    if user is None or not user.is_active:
+        raise credentials_exception()
+    
+    return user
+
+async def get_current_user_id(current_user: models.User = Depends(get_current_user)) -> int:
+    """
+    ID текущего пользователя для эндпоинтов, которым нужен только id.
+    
+    Проверки get_current_user (пользователь существует и активен) сохраняются;
+    FastAPI вызывает зависимость один раз за запрос, сколько бы её ни запрашивали.
+    async: синхронную зависимость FastAPI запускал бы в пуле потоков.
+    """
+    return current_user.id
\ No newline at end of file
@@ -0,0 +1,120 @@
+# app/cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from app.config import settings
+
+class _Retry(Exception):
+    """Общий запрос отменён или устарел: ожидающий повторяет попытку сам"""
+
+class UserQueryCache:
+    """
+    Кэш результатов запросов в памяти процесса с TTL, разбитый по пользователям.
+    
+    Конкурентные промахи по одному ключу ждут один общий запрос (singleflight),
+    поэтому сброс кэша не приводит к лавине одинаковых запросов в БД.
+    Кэш локален для воркера: запись в другом воркере сбросит его только по TTL.
+    """
+
+    def __init__(self, ttl: float, max_users: int = 1024, max_keys: int = 64):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[int, Dict[Hashable, Tuple[float, Any]]]" = OrderedDict()
+        self._pending: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    async def get_or_set(
+        self,
+        user_id: int,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Вернуть значение из кэша или вычислить его через factory()"""
+        if self.ttl <= 0:
+            return await factory()
+        
+        while True:
+            user_entries = self._entries.get(user_id)
+            if user_entries is not None:
+                cached = user_entries.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    return cached[1]
+            
+            pending = self._pending.get((user_id, key))
+            if pending is None:
+                break
+            
+            try:
+                return await asyncio.shield(pending)
+            except _Retry:
+                # Владелец запроса отменён или данные изменились — пробуем заново
+                continue
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[(user_id, key)] = future
+        
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            # Отмена владельца не должна отменять чужие запросы: ожидающие
+            # повторят попытку, и один из них станет новым владельцем
+            self._settle(future, _Retry())
+            raise
+        except BaseException as e:
+            self._settle(future, e)
+            raise
+        finally:
+            # invalidate() снимает общие запросы пользователя: если наш ещё
+            # на месте, данные за время запроса не менялись
+            fresh = self._pending.get((user_id, key)) is future
+            if fresh:
+                del self._pending[(user_id, key)]
+        
+        # Не сохраняем результат, если во время запроса данные пользователя изменились
+        if fresh:
+            self._store(user_id, key, value)
+        
+        if not future.done():
+            future.set_result(value)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        """Сбросить все закэшированные результаты пользователя"""
+        self._entries.pop(user_id, None)
+        
+        # Ожидающие не должны получить результат, начатый до записи: они
+        # перезапросят данные, а владелец вернёт свой результат только себе
+        for pending_key in [k for k in self._pending if k[0] == user_id]:
+            self._settle(self._pending.pop(pending_key), _Retry())
+
+    @staticmethod
+    def _settle(future: asyncio.Future, error: BaseException) -> None:
+        """Завершить общий запрос ошибкой (если он ещё не завершён)"""
+        if not future.done():
+            future.set_exception(error)
+            # Помечаем исключение прочитанным, если ожидающих не было
+            future.exception()
+
+    def _store(self, user_id: int, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        user_entries = self._entries.setdefault(user_id, {})
+        
+        # Ключи с ETag меняются после каждой записи: старые версии больше не
+        # запрашиваются, поэтому вычищаем истёкшие и ограничиваем число ключей
+        for expired_key in [k for k, (expires, _) in user_entries.items() if expires <= now]:
+            del user_entries[expired_key]
+        
+        user_entries.pop(key, None)
+        user_entries[key] = (now + self.ttl, value)
+        while len(user_entries) > self.max_keys:
+            del user_entries[next(iter(user_entries))]
+        
+        self._entries.move_to_end(user_id)
+        
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+query_cache = UserQueryCache(ttl=settings.QUERY_CACHE_TTL_SECONDS)
@@ -11,15 +11,37 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str = "money_tracker"
     
+    # Database pool
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_SYNC_POOL_SIZE: int = 5
+    DB_SYNC_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_TIMEOUT_MS: int = 5000  # 0 — без ограничения
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    DB_USE_PGBOUNCER: bool = False
+    AUTO_CREATE_TABLES: bool = False
+    
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12  # каждый +1 удваивает время хеширования
     
     # App
     APP_NAME: str = "MoneyTracker API"
     DEBUG: bool = False
     FRONTEND_URL: str = "http://localhost:8000"
+    CORS_ORIGINS: str = ""  # через запятую; по умолчанию только FRONTEND_URL
+    LOG_LEVEL: str = "INFO"
+    SERVE_STATIC: bool = True
+    USE_FALLBACK_ROUTES: bool = False
+    
+    # Cache
+    QUERY_CACHE_TTL_SECONDS: int = 10
+    DB_STATUS_TTL_SECONDS: int = 5
     
     class Config:
         env_file = ".env"
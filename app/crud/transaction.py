@@ -1,194 +1,384 @@
-from typing import Optional, List, Dict, Any
+import operator
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from decimal import Decimal
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import and_, or_, func, desc, case, select, update, delete, bindparam, tuple_
 
 from app import models, schemas
+from app.cache import query_cache
+
+# Фильтр списка -> (колонка, оператор сравнения)
+_FILTER_MAP = {
+    'start_date': (models.Transaction.date, operator.ge),
+    'end_date': (models.Transaction.date, operator.le),
+    'category_id': (models.Transaction.category_id, operator.eq),
+    'type': (models.Transaction.type, operator.eq),
+    'min_amount': (models.Transaction.amount, operator.ge),
+    'max_amount': (models.Transaction.amount, operator.le),
+}
+
+def _build_filter_clauses(user_id: int, filters: Optional[Dict[str, Any]]) -> list:
+    """Условия WHERE для списка транзакций пользователя"""
+    clauses = [models.Transaction.user_id == user_id]
+    
+    if filters:
+        clauses.extend(
+            op(column, value)
+            for key, (column, op) in _FILTER_MAP.items()
+            if (value := filters.get(key)) is not None
+        )
+    
+    return clauses
+
+# Колонки TransactionResponse плюс имя и иконка категории (LEFT JOIN)
+_RESPONSE_COLUMNS = (
+    models.Transaction.id,
+    models.Transaction.user_id,
+    models.Transaction.category_id,
+    models.Transaction.amount,
+    models.Transaction.date,
+    models.Transaction.description,
+    models.Transaction.type,
+    models.Transaction.created_at,
+    models.Transaction.updated_at,
+    models.Category.name.label('category_name'),
+    models.Category.icon.label('category_icon')
+)
+
+def _build_stats_stmt(with_start: bool, with_end: bool):
+    """Шаблон запроса статистики; значения подставляются через bind-параметры"""
+    is_income = models.Transaction.type == 'income'
+    is_expense = models.Transaction.type == 'expense'
+    
+    # Одна строка результата: суммы и количества по обоим типам сразу
+    stmt = select(
+        func.coalesce(
+            func.sum(case((is_income, models.Transaction.amount), else_=0)), 0
+        ).label('total_income'),
+        func.coalesce(
+            func.sum(case((is_expense, models.Transaction.amount), else_=0)), 0
+        ).label('total_expense'),
+        func.count().filter(is_income).label('income_count'),
+        func.count().filter(is_expense).label('expense_count')
+    ).where(
+        models.Transaction.user_id == bindparam('user_id')
+    )
+    
+    if with_start:
+        stmt = stmt.where(models.Transaction.date >= bindparam('start_date'))
+    if with_end:
+        stmt = stmt.where(models.Transaction.date <= bindparam('end_date'))
+    
+    return stmt
+
+# Четыре фиксированные формы запроса -> стабильные ключи кэша скомпилированного SQL
+_STATS_STMTS = {
+    (with_start, with_end): _build_stats_stmt(with_start, with_end)
+    for with_start in (False, True)
+    for with_end in (False, True)
+}
 
 class TransactionCRUD:
     @staticmethod
-    def get_transaction(db: Session, transaction_id: int, user_id: int) -> Optional[models.Transaction]:
+    async def get_transaction(db: AsyncSession, transaction_id: int, user_id: int) -> Optional[models.Transaction]:
         """Получить транзакцию по ID с проверкой владельца"""
-        return db.query(models.Transaction).filter(
+        stmt = select(models.Transaction).options(
+            joinedload(models.Transaction.category)
+        ).where(
             and_(
                 models.Transaction.id == transaction_id,
                 models.Transaction.user_id == user_id
             )
-        ).first()
+        )
+        
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        return result.scalars().first()
 
     @staticmethod
-    def get_transactions(
-        db: Session,
+    async def get_transactions(
+        db: AsyncSession,
         user_id: int,
         skip: int = 0,
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[models.Transaction]:
-        """Получить список транзакций с фильтрацией"""
-        query = db.query(models.Transaction).filter(
-            models.Transaction.user_id == user_id
-        )
+        """
+        Получить список транзакций с фильтрацией (OFFSET-пагинация).
+        
+        Устарело: стоимость растёт с номером страницы, используйте get_transactions_page.
+        """
+        # selectinload вместо joinedload: категории догружаются одним IN-запросом,
+        # а LIMIT/OFFSET применяются к транзакциям без размножения строк
+        stmt = select(models.Transaction).options(
+            selectinload(models.Transaction.category)
+        ).where(*_build_filter_clauses(user_id, filters))
         
-        # Применяем фильтры если есть
-        if filters:
-            if filters.get('start_date'):
-                query = query.filter(models.Transaction.date >= filters['start_date'])
-            if filters.get('end_date'):
-                query = query.filter(models.Transaction.date <= filters['end_date'])
-            if filters.get('category_id'):
-                query = query.filter(models.Transaction.category_id == filters['category_id'])
-            if filters.get('type'):
-                query = query.filter(models.Transaction.type == filters['type'])
-            if filters.get('min_amount'):
-                query = query.filter(models.Transaction.amount >= filters['min_amount'])
-            if filters.get('max_amount'):
-                query = query.filter(models.Transaction.amount <= filters['max_amount'])
-        
-        return query.order_by(desc(models.Transaction.date)).offset(skip).limit(limit).all()
+        stmt = stmt.order_by(desc(models.Transaction.date)).offset(skip).limit(limit)
+        
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
 
     @staticmethod
-    def create_transaction(
-        db: Session,
+    async def get_transactions_page(
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[models.Transaction], Optional[Tuple[datetime, int]]]:
+        """
+        Получить страницу транзакций keyset-пагинацией по (date DESC, id DESC).
+        
+        cursor — (date, id) последней записи предыдущей страницы. Возвращает
+        записи и курсор следующей страницы (None, если страница последняя).
+        """
+        clauses = _build_filter_clauses(user_id, filters)
+        
+        if cursor is not None:
+            clauses.append(
+                tuple_(models.Transaction.date, models.Transaction.id) < tuple_(*cursor)
+            )
+        
+        # Лишняя (limit + 1) строка показывает, есть ли следующая страница
+        stmt = select(models.Transaction).options(
+            selectinload(models.Transaction.category)
+        ).where(*clauses).order_by(
+            desc(models.Transaction.date),
+            desc(models.Transaction.id)
+        ).limit(limit + 1)
+        
+        result = await db.execute(stmt)
+        rows = list(result.scalars().all())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        next_cursor = (rows[-1].date, rows[-1].id) if has_more else None
+        
+        return rows, next_cursor
+
+    @staticmethod
+    async def list_transactions_rows(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[schemas.TransactionResponse]:
+        """
+        Список транзакций для API без ORM-сущностей.
+        
+        Выбираются только колонки ответа (плюс имя и иконка категории), строки
+        не попадают в identity map, а ответы собираются через model_construct
+        без повторной валидации данных, уже проверенных БД.
+        """
+        stmt = select(*_RESPONSE_COLUMNS).outerjoin(
+            models.Category,
+            models.Transaction.category_id == models.Category.id
+        ).where(
+            *_build_filter_clauses(user_id, filters)
+        ).order_by(
+            desc(models.Transaction.date)
+        ).offset(skip).limit(limit)
+        
+        rows = (await db.execute(stmt)).all()
+        
+        return [
+            schemas.TransactionResponse.model_construct(
+                **{**row._mapping, 'type': schemas.TransactionType(row.type)}
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    async def create_transaction(
+        db: AsyncSession,
         transaction: schemas.TransactionCreate,
         user_id: int
     ) -> models.Transaction:
         """Создать новую транзакцию"""
         db_transaction = models.Transaction(
-            **transaction.dict(),
+            **transaction.model_dump(),
             user_id=user_id
         )
         
         db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
+        await db.commit()
+        query_cache.invalidate(user_id)
         
-        return db_transaction
+        # Перечитываем вместе с категорией: ленивая загрузка в AsyncSession недоступна
+        return await TransactionCRUD.get_transaction(db, db_transaction.id, user_id)
 
     @staticmethod
-    def update_transaction(
-        db: Session,
+    async def update_transaction(
+        db: AsyncSession,
         transaction_id: int,
         user_id: int,
         transaction_update: schemas.TransactionUpdate
     ) -> Optional[models.Transaction]:
-        """Обновить транзакцию"""
-        db_transaction = TransactionCRUD.get_transaction(db, transaction_id, user_id)
-        
-        if db_transaction:
-            update_data = transaction_update.dict(exclude_unset=True)
-            
-            for field, value in update_data.items():
-                setattr(db_transaction, field, value)
-            
-            db.commit()
-            db.refresh(db_transaction)
+        """Обновить транзакцию одним UPDATE ... RETURNING"""
+        update_data = transaction_update.model_dump(exclude_unset=True)
+        
+        if not update_data:
+            return await TransactionCRUD.get_transaction(db, transaction_id, user_id)
+        
+        stmt = update(models.Transaction).where(
+            and_(
+                models.Transaction.id == transaction_id,
+                models.Transaction.user_id == user_id
+            )
+        ).values(**update_data).returning(models.Transaction).options(
+            selectinload(models.Transaction.category)
+        )
+        
+        result = await db.execute(
+            stmt,
+            execution_options={"populate_existing": True}
+        )
+        db_transaction = result.scalar_one_or_none()
+        await db.commit()
+        query_cache.invalidate(user_id)
         
         return db_transaction
 
     @staticmethod
-    def delete_transaction(db: Session, transaction_id: int, user_id: int) -> bool:
-        """Удалить транзакцию"""
-        db_transaction = TransactionCRUD.get_transaction(db, transaction_id, user_id)
+    async def delete_transaction(db: AsyncSession, transaction_id: int, user_id: int) -> bool:
+        """Удалить транзакцию одним DELETE ... RETURNING"""
+        stmt = delete(models.Transaction).where(
+            and_(
+                models.Transaction.id == transaction_id,
+                models.Transaction.user_id == user_id
+            )
+        ).returning(models.Transaction.id)
         
-        if db_transaction:
-            db.delete(db_transaction)
-            db.commit()
-            return True
+        result = await db.execute(stmt)
+        deleted_id = result.scalar_one_or_none()
+        await db.commit()
+        query_cache.invalidate(user_id)
         
-        return False
+        return deleted_id is not None
 
     @staticmethod
-    def get_transaction_stats(
-        db: Session,
+    async def get_transaction_stats(
+        db: AsyncSession,
         user_id: int,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Получить статистику по транзакциям"""
-        query = db.query(
-            models.Transaction.type,
-            func.count(models.Transaction.id).label('count'),
-            func.sum(models.Transaction.amount).label('total'),
-            func.avg(models.Transaction.amount).label('average')
-        ).filter(
-            models.Transaction.user_id == user_id
+        """Получить статистику по транзакциям (с кэшированием)"""
+        return await query_cache.get_or_set(
+            user_id,
+            ('stats', start_date, end_date),
+            lambda: TransactionCRUD._compute_transaction_stats(db, user_id, start_date, end_date)
         )
+
+    @staticmethod
+    async def _compute_transaction_stats(
+        db: AsyncSession,
+        user_id: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Dict[str, Any]:
+        stmt = _STATS_STMTS[(start_date is not None, end_date is not None)]
+        params = {'user_id': user_id}
         
-        if start_date:
-            query = query.filter(models.Transaction.date >= start_date)
-        if end_date:
-            query = query.filter(models.Transaction.date <= end_date)
+        if start_date is not None:
+            params['start_date'] = start_date
+        if end_date is not None:
+            params['end_date'] = end_date
         
-        stats = query.group_by(models.Transaction.type).all()
+        row = (await db.execute(stmt, params)).one()
         
-        result = {
-            'total_income': Decimal('0'),
-            'total_expense': Decimal('0'),
-            'income_count': 0,
-            'expense_count': 0,
-            'net_balance': Decimal('0'),
-            'total_transactions': 0
+        return {
+            'total_income': row.total_income,
+            'total_expense': row.total_expense,
+            'income_count': row.income_count,
+            'expense_count': row.expense_count,
+            'net_balance': row.total_income - row.total_expense,
+            'total_transactions': row.income_count + row.expense_count
         }
-        
-        for stat in stats:
-            if stat.type == 'income':
-                result['total_income'] = stat.total or Decimal('0')
-                result['income_count'] = stat.count or 0
-            elif stat.type == 'expense':
-                result['total_expense'] = stat.total or Decimal('0')
-                result['expense_count'] = stat.count or 0
-        
-        result['net_balance'] = result['total_income'] - result['total_expense']
-        result['total_transactions'] = result['income_count'] + result['expense_count']
-        
-        return result
 
     @staticmethod
-    def get_recent_transactions(
-        db: Session,
+    async def get_recent_transactions(
+        db: AsyncSession,
         user_id: int,
         days: int = 30,
         limit: int = 50
-    ) -> List[models.Transaction]:
-        """Получить последние транзакции за указанное количество дней"""
+    ) -> Tuple[Row, ...]:
+        """
+        Получить последние транзакции за указанное количество дней (с кэшированием).
+        
+        Кэш общий для всех запросов процесса, поэтому в нём лежат неизменяемые
+        строки колонок, а не ORM-сущности, привязанные к сессии одного запроса.
+        """
+        return await query_cache.get_or_set(
+            user_id,
+            ('recent', days, limit),
+            lambda: TransactionCRUD._fetch_recent_transactions(db, user_id, days, limit)
+        )
+
+    @staticmethod
+    async def _fetch_recent_transactions(
+        db: AsyncSession,
+        user_id: int,
+        days: int,
+        limit: int
+    ) -> Tuple[Row, ...]:
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        return db.query(models.Transaction).filter(
+        stmt = select(*_RESPONSE_COLUMNS).outerjoin(
+            models.Category,
+            models.Transaction.category_id == models.Category.id
+        ).where(
             and_(
                 models.Transaction.user_id == user_id,
                 models.Transaction.date >= start_date
             )
-        ).order_by(desc(models.Transaction.date)).limit(limit).all()
+        ).order_by(desc(models.Transaction.date)).limit(limit)
+        
+        result = await db.execute(stmt)
+        return tuple(result.all())
 
     @staticmethod
-    def get_transactions_by_category(
-        db: Session,
+    async def get_transactions_by_category(
+        db: AsyncSession,
         user_id: int,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """Получить транзакции сгруппированные по категориям"""
-        query = db.query(
-            models.Category.name,
-            models.Category.icon,
+        # Сначала агрегируем транзакции по (category_id, type), затем
+        # присоединяем категории: JOIN идёт по числу групп, а не по числу строк
+        totals = select(
+            models.Transaction.category_id,
             models.Transaction.type,
             func.sum(models.Transaction.amount).label('total'),
             func.count(models.Transaction.id).label('count')
-        ).join(
-            models.Category,
-            models.Transaction.category_id == models.Category.id
-        ).filter(
+        ).where(
             models.Transaction.user_id == user_id
         )
         
         if start_date:
-            query = query.filter(models.Transaction.date >= start_date)
+            totals = totals.where(models.Transaction.date >= start_date)
         if end_date:
-            query = query.filter(models.Transaction.date <= end_date)
+            totals = totals.where(models.Transaction.date <= end_date)
+        
+        totals = totals.group_by(
+            models.Transaction.category_id,
+            models.Transaction.type
+        ).subquery()
         
-        return query.group_by(
+        stmt = select(
             models.Category.name,
             models.Category.icon,
-            models.Transaction.type
-        ).all()
\ No newline at end of file
+            totals.c.type,
+            totals.c.total,
+            totals.c.count
+        ).join(
+            totals,
+            totals.c.category_id == models.Category.id
+        )
+        
+        result = await db.execute(stmt)
+        return list(result.all())
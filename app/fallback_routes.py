@@ -0,0 +1,19 @@
+# app/fallback_routes.py
+import os
+
+from fastapi import APIRouter
+
+from app.database import DatabaseStatus, get_database_status
+
+# Минимальный набор маршрутов для диагностики деплоя, когда основные роутеры
+# не подключаются (включается через USE_FALLBACK_ROUTES)
+router = APIRouter(tags=["fallback"])
+
+@router.get("/api/v1/db/check")
+async def check_db():
+    db_state, db_status = await get_database_status()
+    return {
+        "database": "PostgreSQL" if "postgresql" in os.getenv("DATABASE_URL", "") else "SQLite",
+        "status": "disconnected" if db_state is DatabaseStatus.ERROR else "connected",
+        "message": db_status
+    }
@@ -0,0 +1,35 @@
+# app/logging_config.py
+import json
+import logging
+import sys
+
+from app.config import settings
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись лога — одна строка JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        
+        return json.dumps(payload, ensure_ascii=False)
+
+def setup_logging() -> None:
+    """Настроить корневой логгер (один раз при старте приложения)"""
+    root = logging.getLogger()
+    
+    if any(isinstance(h.formatter, JsonFormatter) for h in root.handlers):
+        return
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
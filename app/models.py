@@ -18,6 +18,9 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Счётчик записей транзакций через API: входит в ETag, в отличие от отметок
+    # времени не зависит от их точности (в SQLite — до секунды)
+    transactions_version = Column(Integer, nullable=False, server_default="0")
 
     # Связи
     transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
@@ -74,7 +77,11 @@ class Transaction(Base):
     # Индексы и ограничения
     __table_args__ = (
         CheckConstraint('amount > 0', name='check_amount_positive'),
-        Index('ix_transactions_user_date', 'user_id', 'date'),
+        # id — разрыв равенства дат: ORDER BY date DESC, id DESC и keyset-пагинация
+        # идут по индексу без сортировки
+        Index('ix_transactions_user_date_id', 'user_id', 'date', 'id'),
+        Index('ix_transactions_user_type_date', 'user_id', 'type', 'date'),
+        Index('ix_transactions_user_category', 'user_id', 'category_id'),
         Index('ix_transactions_category_date', 'category_id', 'date'),
     )
 
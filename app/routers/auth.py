@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, bindparam
+from sqlalchemy.exc import IntegrityError
 from datetime import timedelta
 
 from app.database import get_db
@@ -8,40 +11,49 @@ from app.auth import (
     get_password_hash, 
     verify_password,
     create_access_token,
-    get_current_user
+    get_current_user,
+    BEARER_CHALLENGE
 )
 from app.config import settings
 
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
+# Стандартные категории, которые получает каждый новый пользователь
+DEFAULT_CATEGORIES = [
+    {"name": "Зарплата", "type": "income", "icon": "💰", "color": "#48bb78"},
+    {"name": "Продукты", "type": "expense", "icon": "🛒", "color": "#4299e1"},
+    {"name": "Транспорт", "type": "expense", "icon": "🚗", "color": "#ed8936"},
+    {"name": "Развлечения", "type": "expense", "icon": "🎬", "color": "#9f7aea"},
+    {"name": "Здоровье", "type": "expense", "icon": "🏥", "color": "#f56565"},
+]
+
+LOGIN_QUERY = select(
+    models.User.id,
+    models.User.username,
+    models.User.email,
+    models.User.hashed_password,
+    models.User.is_active,
+    models.User.created_at
+).where(models.User.email == bindparam("email")).limit(1)
+
+def registration_conflict_detail(error: IntegrityError) -> str:
+    """Текст ошибки регистрации по нарушенному уникальному индексу users"""
+    # psycopg2 сообщает имя индекса (ix_users_email), SQLite — колонку (users.email)
+    diag = getattr(error.orig, "diag", None)
+    source = getattr(diag, "constraint_name", None) or str(error.orig)
+    
+    if "email" in source:
+        return "Пользователь с таким email уже существует"
+    if "username" in source:
+        return "Пользователь с таким именем уже существует"
+    return "Пользователь с таким email или именем уже существует"
+
 @router.post("/register", response_model=schemas.UserResponse)
-async def register(
+def register(
     user_data: schemas.UserCreate,
     db: Session = Depends(get_db)
 ):
     """Регистрация нового пользователя"""
-    # Проверяем, существует ли пользователь с таким email
-    existing_user = db.query(models.User).filter(
-        models.User.email == user_data.email
-    ).first()
-    
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Пользователь с таким email уже существует"
-        )
-    
-    # Проверяем, существует ли пользователь с таким username
-    existing_username = db.query(models.User).filter(
-        models.User.username == user_data.username
-    ).first()
-    
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Пользователь с таким именем уже существует"
-        )
-    
     # Создаем нового пользователя
     hashed_password = get_password_hash(user_data.password)
     db_user = models.User(
@@ -51,44 +63,44 @@ async def register(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
     
-    # Создаем стандартные категории для пользователя
-    default_categories = [
-        {"name": "Зарплата", "type": "income", "icon": "💰", "color": "#48bb78"},
-        {"name": "Продукты", "type": "expense", "icon": "🛒", "color": "#4299e1"},
-        {"name": "Транспорт", "type": "expense", "icon": "🚗", "color": "#ed8936"},
-        {"name": "Развлечения", "type": "expense", "icon": "🎬", "color": "#9f7aea"},
-        {"name": "Здоровье", "type": "expense", "icon": "🏥", "color": "#f56565"},
-    ]
-    
-    for category_data in default_categories:
-        category = models.Category(
-            user_id=db_user.id,
-            **category_data
+    try:
+        # flush, а не commit: пользователь и его категории уходят одной транзакцией
+        db.flush()
+    except IntegrityError as e:
+        # Занятость email/username проверяют уникальные индексы при вставке:
+        # без отдельного SELECT и без гонки между проверкой и INSERT
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=registration_conflict_detail(e)
         )
-        db.add(category)
+    
+    # Создаем стандартные категории для пользователя одним INSERT (executemany)
+    db.execute(
+        insert(models.Category),
+        [{"user_id": db_user.id, **category_data} for category_data in DEFAULT_CATEGORIES]
+    )
     
     db.commit()
+    db.refresh(db_user)
     
     return db_user
 
 @router.post("/login")
-async def login(
+def login(
     credentials: schemas.UserLogin,
     db: Session = Depends(get_db)
 ):
     """Вход пользователя"""
-    user = db.query(models.User).filter(
-        models.User.email == credentials.email
-    ).first()
+    # Только нужные для входа колонки: строка без ORM-объекта и identity map
+    user = db.execute(LOGIN_QUERY, {"email": credentials.email}).first()
     
     if not user or not verify_password(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный email или пароль",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=BEARER_CHALLENGE,
         )
     
     if not user.is_active:
@@ -128,14 +140,17 @@ async def get_current_user_info(
         "is_active": current_user.is_active
     }
 
+# Ответ тестового эндпоинта не меняется: сериализуем его один раз
+TEST_AUTH_RESPONSE = ORJSONResponse({
+    "message": "Auth router работает",
+    "endpoints": [
+        "POST /api/v1/auth/register",
+        "POST /api/v1/auth/login",
+        "GET /api/v1/auth/me"
+    ]
+})
+
 @router.get("/test")
 async def test_auth():
     """Тестовый эндпоинт аутентификации"""
-    return {
-        "message": "Auth router работает",
-        "endpoints": [
-            "POST /api/v1/auth/register",
-            "POST /api/v1/auth/login",
-            "GET /api/v1/auth/me"
-        ]
-    }
\ No newline at end of file
+    return TEST_AUTH_RESPONSE
\ No newline at end of file
@@ -1,7 +1,11 @@
 from fastapi import APIRouter 
+from fastapi.responses import ORJSONResponse
  
 router = APIRouter(prefix="/categories", tags=["categories"]) 
  
+# Ответ не меняется: сериализуем его один раз
+TEST_CATEGORIES_RESPONSE = ORJSONResponse({"message": "Categories router works!"})
+
 @router.get("/test") 
-def test_categories(): 
-    return {"message": "Categories router works!"} 
+async def test_categories(): 
+    return TEST_CATEGORIES_RESPONSE 
@@ -1,20 +1,45 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db, check_database_connection
+from typing import Optional
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, AsyncSessionLocal, IS_SQLITE
 
 router = APIRouter(prefix="/api/v1/db", tags=["database"])
 
+# Запросы зависят от диалекта: у SQLite нет version() и information_schema
+VERSION_QUERY = text("SELECT sqlite_version()" if IS_SQLITE else "SELECT version()")
+TABLES_QUERY = text(
+    "SELECT name FROM sqlite_master WHERE type = 'table'"
+    if IS_SQLITE else
+    "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'"
+)
+PING_QUERY = text("SELECT 1")
+
+async def fetch_database_version() -> Optional[str]:
+    """Версия сервера БД для app.state.db_version (None — БД недоступна)"""
+    try:
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(VERSION_QUERY)).scalar()
+    except Exception:
+        return None
+
 @router.get("/check")
-async def check_db_connection(db: Session = Depends(get_db)):
+async def check_db_connection(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Проверка подключения к базе данных"""
     try:
-        # Простой запрос для проверки
-        result = db.execute("SELECT version()")
-        db_version = result.fetchone()[0]
+        # Версия сервера не меняется за время жизни воркера: её читают при старте,
+        # а здесь достаточно простого SELECT 1
+        db_version = getattr(request.app.state, "db_version", None)
+        
+        if db_version is None:
+            db_version = (await db.execute(VERSION_QUERY)).scalar()
+            request.app.state.db_version = db_version
+        else:
+            await db.execute(PING_QUERY)
         
         return {
             "status": "connected",
-            "database": "PostgreSQL",
+            "database": "SQLite" if IS_SQLITE else "PostgreSQL",
             "version": db_version.split(',')[0] if db_version else "Unknown",
             "message": "✅ База данных подключена успешно"
         }
@@ -28,17 +53,12 @@ async def check_db_connection(db: Session = Depends(get_db)):
         }
 
 @router.get("/tables")
-async def list_tables(db: Session = Depends(get_db)):
+async def list_tables(db: AsyncSession = Depends(get_async_db)):
     """Список таблиц в базе данных"""
     try:
-        # Запрос для получения списка таблиц (PostgreSQL)
-        result = db.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-        """)
+        result = await db.execute(TABLES_QUERY)
         
-        tables = [row[0] for row in result.fetchall()]
+        tables = list(result.scalars().all())
         
         return {
             "status": "success",
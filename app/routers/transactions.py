@@ -1,94 +1,436 @@
-from typing import Optional, List
+import base64
+import binascii
+import hashlib
+from typing import AsyncIterator, Optional, List, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from pydantic import TypeAdapter
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, update, delete, bindparam, tuple_, Float
 
 from app import models, schemas
-from app.database import get_db
-from app.auth import get_current_user
+from app.database import get_async_db, AsyncSessionLocal
+from app.auth import get_current_user_id
+from app.cache import query_cache
 
 router = APIRouter(prefix="/api/v1/transactions", tags=["transactions"])
 
+# Имя и иконка категории выбираются колонками того же запроса (LEFT JOIN);
+# из транзакции читаются только поля TransactionResponse.
+# Связи ORM и невыбранные колонки не загружаются: обращение к ним падает сразу,
+# а не тихо добавляет запрос на каждую строку
+TRANSACTION_LOAD_OPTIONS = (
+    load_only(
+        models.Transaction.id,
+        models.Transaction.user_id,
+        models.Transaction.category_id,
+        models.Transaction.amount,
+        models.Transaction.date,
+        models.Transaction.description,
+        models.Transaction.type,
+        models.Transaction.created_at,
+        models.Transaction.updated_at,
+        raiseload=True
+    ),
+    raiseload('*')
+)
+CATEGORY_COLUMNS = (
+    models.Category.name.label('category_name'),
+    models.Category.icon.label('category_icon')
+)
+
+def select_transactions(*columns):
+    """SELECT транзакций с колонками категории через LEFT JOIN"""
+    return select(
+        models.Transaction, *CATEGORY_COLUMNS, *columns
+    ).outerjoin(
+        models.Category,
+        models.Transaction.category_id == models.Category.id
+    ).options(*TRANSACTION_LOAD_OPTIONS)
+
+def transaction_response(
+    transaction: models.Transaction,
+    category_name: Optional[str] = None,
+    category_icon: Optional[str] = None
+) -> schemas.TransactionResponse:
+    """Ответ API по транзакции и уже выбранным полям категории"""
+    response = schemas.TransactionResponse.model_validate(transaction)
+    response.category_name = category_name
+    response.category_icon = category_icon
+    
+    return response
+
+async def find_category(db: AsyncSession, category_id: int, user_id: int):
+    """Тип, имя и иконка категории пользователя одной строкой, без ORM-объекта (None — нет такой)"""
+    return (await db.execute(
+        select(
+            models.Category.type,
+            models.Category.name,
+            models.Category.icon
+        ).where(
+            models.Category.id == category_id,
+            models.Category.user_id == user_id
+        )
+    )).one_or_none()
+
+# Валидация списка одним вызовом pydantic-core вместо model_validate на каждую строку
+TRANSACTION_LIST_ADAPTER = TypeAdapter(List[schemas.TransactionResponse])
+
+def transaction_responses(rows) -> List[schemas.TransactionResponse]:
+    """Ответы API по строкам select_transactions: (транзакция, имя и иконка категории, ...)"""
+    items = TRANSACTION_LIST_ADAPTER.validate_python(
+        [row[0] for row in rows], from_attributes=True
+    )
+    for item, row in zip(items, rows):
+        item.category_name, item.category_icon = row[1], row[2]
+    
+    return items
+
+# "Версия" данных пользователя: меняется при любой вставке, изменении или удалении.
+# Счётчик users.transactions_version различает записи API в пределах одной секунды,
+# количество и отметки времени — записи в обход API
+TRANSACTIONS_VERSION_QUERY = select(
+    func.count(),
+    func.max(models.Transaction.created_at),
+    func.max(models.Transaction.updated_at),
+    select(models.User.transactions_version).where(
+        models.User.id == bindparam("user_id")
+    ).scalar_subquery()
+).where(models.Transaction.user_id == bindparam("user_id"))
+
+BUMP_TRANSACTIONS_VERSION = update(models.User).where(
+    models.User.id == bindparam("user_id")
+).values(
+    transactions_version=models.User.transactions_version + 1
+).execution_options(synchronize_session=False)
+
+async def commit_transactions_write(db: AsyncSession, user_id: int) -> None:
+    """Зафиксировать запись транзакций: новая версия данных (ETag) и сброс кэша"""
+    await db.execute(BUMP_TRANSACTIONS_VERSION, {"user_id": user_id})
+    await db.commit()
+    query_cache.invalidate(user_id)
+
+# Ответ можно хранить только в браузере пользователя и только с перепроверкой
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# Построчная выдача по Accept: application/x-ndjson — один JSON-объект на строку
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 100
+# JSON и NDJSON — разные представления одного URL: кэши различают их по Accept
+VARY_ACCEPT = "Accept"
+
+async def stream_transactions(stmt) -> AsyncIterator[bytes]:
+    """
+    Строки select_transactions в NDJSON пачками по STREAM_BATCH_SIZE с серверного курсора.
+    
+    Сессия своя: генератор работает уже после выхода из обработчика,
+    а память не зависит от размера выборки.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        
+        async for rows in result.partitions():
+            for item in transaction_responses(rows):
+                yield item.model_dump_json().encode() + b"\n"
+
+async def transactions_etag(db: AsyncSession, request: Request, user_id: int) -> str:
+    """
+    Слабый ETag выборки: версия данных пользователя + путь и параметры запроса.
+    
+    Один дешёвый агрегат по индексу user_id вместо основной выборки:
+    при совпадении с If-None-Match ответ 304 отдаётся без неё.
+    """
+    version = (await db.execute(TRANSACTIONS_VERSION_QUERY, {"user_id": user_id})).one()
+    raw = f"{user_id}:{request.url.path}?{request.url.query}:{tuple(version)}"
+    
+    return f'W/"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Совпадает ли ETag с заголовком If-None-Match.
+    
+    Заголовок — список тегов через запятую или "*"; для If-None-Match
+    сравнение слабое, поэтому префикс W/ не учитывается.
+    """
+    if not if_none_match:
+        return False
+    
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags:
+        return True
+    
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in tags)
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Ответ 304, если у клиента актуальная версия"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        )
+    return None
+
+def transaction_filters(
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    type: Optional[schemas.TransactionType] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None
+) -> list:
+    """Условия WHERE для транзакций пользователя по фильтрам запроса"""
+    conditions = [models.Transaction.user_id == user_id]
+    
+    if start_date:
+        conditions.append(models.Transaction.date >= start_date)
+    if end_date:
+        conditions.append(models.Transaction.date <= end_date)
+    if category_id:
+        conditions.append(models.Transaction.category_id == category_id)
+    if type:
+        conditions.append(models.Transaction.type == type.value)
+    if min_amount:
+        conditions.append(models.Transaction.amount >= min_amount)
+    if max_amount:
+        conditions.append(models.Transaction.amount <= max_amount)
+    
+    return conditions
+
+def period_sum(conditions: list, transaction_type: str):
+    """
+    Скалярный подзапрос: сумма транзакций одного типа по условиям.
+    
+    Сумма только для отображения: округляется до копеек и приводится к float
+    в SQL, поэтому драйвер не создаёт Decimal.
+    """
+    return select(
+        func.round(func.coalesce(func.sum(models.Transaction.amount), 0), 2).cast(Float)
+    ).where(
+        *conditions,
+        models.Transaction.type == transaction_type
+    ).scalar_subquery()
+
+async def compute_transaction_stats(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> dict:
+    """Статистика за период для /stats/summary"""
+    period = transaction_filters(user_id, start_date, end_date)
+    
+    # Суммы по типам и количество за период — одним запросом
+    total_income, total_expense, transaction_count = (await db.execute(
+        select(
+            period_sum(period, 'income'),
+            period_sum(period, 'expense'),
+            select(func.count()).where(*period).scalar_subquery()
+        )
+    )).one()
+    
+    # Рассчитываем среднее
+    total_amount = total_income + total_expense
+    average_transaction = (
+        total_amount / transaction_count 
+        if transaction_count > 0 
+        else 0.0
+    )
+    
+    return {
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "net_balance": round(total_income - total_expense, 2),
+        "transaction_count": transaction_count,
+        "average_transaction": average_transaction,
+        "period": {
+            "start_date": start_date,
+            "end_date": end_date
+        }
+    }
+
+async def compute_category_totals(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> dict:
+    """Суммы и количество по категориям за период для /by-category"""
+    # Сначала агрегат по (category_id, type) только по транзакциям,
+    # затем JOIN к категориям — уже по сгруппированным строкам;
+    # сумма округляется до копеек и приводится к float в SQL, без Decimal на каждую группу
+    totals = select(
+        models.Transaction.category_id,
+        models.Transaction.type,
+        func.round(func.sum(models.Transaction.amount), 2).cast(Float).label('total'),
+        func.count().label('count')
+    ).where(
+        *transaction_filters(user_id, start_date, end_date),
+        models.Transaction.category_id.is_not(None)
+    ).group_by(
+        models.Transaction.category_id,
+        models.Transaction.type
+    ).subquery()
+    
+    results = (await db.execute(
+        select(
+            models.Category.name,
+            models.Category.icon,
+            totals.c.type,
+            totals.c.total,
+            totals.c.count
+        ).join(
+            totals,
+            totals.c.category_id == models.Category.id
+        )
+    )).all()
+    
+    categories = [
+        {
+            "name": name,
+            "icon": icon,
+            "type": type_,
+            "total": total,
+            "count": count
+        }
+        for name, icon, type_, total, count in results
+    ]
+    
+    return {
+        "categories": categories,
+        "count": len(categories),
+        "period": {
+            "start_date": start_date,
+            "end_date": end_date
+        }
+    }
+
+def encode_cursor(transaction: models.Transaction) -> str:
+    """Курсор следующей страницы: (date, id) последней записи в base64"""
+    raw = f"{transaction.date.isoformat()}|{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Разобрать курсор из encode_cursor (400 при любой ошибке формата)"""
+    try:
+        raw_date, raw_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(raw_date), int(raw_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор пагинации"
+        )
+
 @router.get("/", response_model=schemas.PaginatedTransactions)
-def get_transactions(
+async def get_transactions(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Количество пропускаемых записей"),
     limit: int = Query(100, ge=1, le=200, description="Количество возвращаемых записей"),
+    cursor: Optional[str] = Query(None, description="Курсор next_cursor предыдущей страницы (вместо skip)"),
     start_date: Optional[datetime] = Query(None, description="Начальная дата (фильтр)"),
     end_date: Optional[datetime] = Query(None, description="Конечная дата (фильтр)"),
     category_id: Optional[int] = Query(None, description="ID категории (фильтр)"),
     type: Optional[schemas.TransactionType] = Query(None, description="Тип транзакции: income/expense"),
     min_amount: Optional[Decimal] = Query(None, ge=0, description="Минимальная сумма"),
     max_amount: Optional[Decimal] = Query(None, ge=0, description="Максимальная сумма"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Получить список транзакций с возможностью фильтрации.
-    """
-    # Строим запрос
-    query = db.query(models.Transaction).filter(
-        models.Transaction.user_id == current_user.id
-    )
     
-    # Применяем фильтры
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(models.Transaction.date <= end_date)
-    if category_id:
-        query = query.filter(models.Transaction.category_id == category_id)
-    if type:
-        query = query.filter(models.Transaction.type == type.value)
-    if min_amount:
-        query = query.filter(models.Transaction.amount >= min_amount)
-    if max_amount:
-        query = query.filter(models.Transaction.amount <= max_amount)
-    
-    # Получаем общее количество
-    total = query.count()
-    
-    # Получаем данные с пагинацией
-    transactions = query.order_by(
-        desc(models.Transaction.date)
-    ).offset(skip).limit(limit).all()
+    Глубокие страницы лучше листать через cursor (keyset-пагинация по date, id):
+    стоимость не растёт с номером страницы, в отличие от skip (OFFSET).
     
-    # Преобразуем в response
-    items = []
-    for transaction in transactions:
-        transaction_dict = schemas.TransactionResponse.from_orm(transaction)
-        
-        # Добавляем информацию о категории
-        if transaction.category:
-            transaction_dict.category_name = transaction.category.name
-            transaction_dict.category_icon = transaction.category.icon
-        
-        items.append(transaction_dict)
-    
-    # Рассчитываем статистику
-    income_query = db.query(func.sum(models.Transaction.amount)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.type == 'income'
-    )
-    expense_query = db.query(func.sum(models.Transaction.amount)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.type == 'expense'
+    С заголовком Accept: application/x-ndjson та же страница (фильтры, cursor,
+    skip и limit) отдаётся потоком по одной транзакции на строку, без обёртки,
+    счётчиков и ETag.
+    """
+    conditions = transaction_filters(
+        user_id, start_date, end_date,
+        category_id, type, min_amount, max_amount
     )
+    # Сводка по доходам/расходам учитывает только период, без остальных фильтров
+    period = transaction_filters(user_id, start_date, end_date)
+    
+    if cursor:
+        # Keyset: страница начинается сразу после записи из курсора, skip не нужен;
+        # общее количество считается отдельно, без курсора
+        page_conditions = [
+            *conditions,
+            tuple_(models.Transaction.date, models.Transaction.id) < tuple_(*decode_cursor(cursor))
+        ]
+        total_column = select(func.count()).where(*conditions).scalar_subquery()
+        offset = 0
+    else:
+        page_conditions = conditions
+        total_column = func.count().over()
+        offset = skip
+    
+    order = (desc(models.Transaction.date), desc(models.Transaction.id))
+    
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        stmt = select_transactions().where(
+            *page_conditions
+        ).order_by(*order).offset(offset).limit(limit)
+        
+        return StreamingResponse(
+            stream_transactions(stmt),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Vary": VARY_ACCEPT}
+        )
     
-    if start_date:
-        income_query = income_query.filter(models.Transaction.date >= start_date)
-        expense_query = expense_query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        income_query = income_query.filter(models.Transaction.date <= end_date)
-        expense_query = expense_query.filter(models.Transaction.date <= end_date)
+    etag = await transactions_etag(db, request, user_id)
+    cached = not_modified(request, etag)
+    if cached:
+        cached.headers["Vary"] = VARY_ACCEPT
+        return cached
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    response.headers["Vary"] = VARY_ACCEPT
+    
+    # Страница, общее количество (окно до LIMIT) и суммы за период — одним запросом;
+    # поля категории приходят колонками той же строки, а не запросом на строку.
+    # Лишняя (limit + 1) строка показывает, есть ли следующая страница
+    rows = (await db.execute(
+        select_transactions(
+            total_column.label('total'),
+            period_sum(period, 'income').label('total_income'),
+            period_sum(period, 'expense').label('total_expense')
+        ).where(
+            *page_conditions
+        ).order_by(
+            *order
+        ).offset(offset).limit(limit + 1)
+    )).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    if rows:
+        total, total_income, total_expense = rows[0][3:]
+    else:
+        # Пустая страница: оконной функции не на чем вернуть итоги
+        total, total_income, total_expense = (await db.execute(
+            select(
+                func.count(),
+                period_sum(period, 'income'),
+                period_sum(period, 'expense')
+            ).select_from(models.Transaction).where(*conditions)
+        )).one()
     
-    total_income = income_query.scalar() or Decimal('0')
-    total_expense = expense_query.scalar() or Decimal('0')
+    # Преобразуем в response
+    items = transaction_responses(rows)
     
     # Рассчитываем пагинацию
     pages = (total + limit - 1) // limit if limit > 0 else 0
-    page = (skip // limit) + 1 if limit > 0 else 1
+    # Номер страницы по курсору неизвестен: позиция считается только от skip
+    page = None if cursor else (skip // limit) + 1
     
     return {
         "items": items,
@@ -96,10 +438,11 @@ def get_transactions(
         "page": page,
         "size": limit,
         "pages": pages,
+        "next_cursor": encode_cursor(rows[-1][0]) if has_more else None,
         "summary": {
-            "total_income": float(total_income),
-            "total_expense": float(total_expense),
-            "net_balance": float(total_income - total_expense),
+            "total_income": total_income,
+            "total_expense": total_expense,
+            "net_balance": round(total_income - total_expense, 2),
             "transaction_count": total
         }
     }
@@ -108,20 +451,18 @@ def get_transactions(
     response_model=schemas.TransactionResponse,
     status_code=status.HTTP_201_CREATED
 )
-def create_transaction(
+async def create_transaction(
     transaction: schemas.TransactionCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Создать новую транзакцию.
     """
     # Проверяем категорию если указана
+    category = None
     if transaction.category_id:
-        category = db.query(models.Category).filter(
-            models.Category.id == transaction.category_id,
-            models.Category.user_id == current_user.id
-        ).first()
+        category = await find_category(db, transaction.category_id, user_id)
         
         if not category:
             raise HTTPException(
@@ -135,85 +476,103 @@ def create_transaction(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=(
                     f"Тип категории '{category.type}' "
-                    f"не соответствует типу транзакции '{transaction.type}'"
+                    f"не соответствует типу транзакции '{transaction.type.value}'"
                 )
             )
     
     # Создаем транзакцию
     db_transaction = models.Transaction(
-        **transaction.dict(),
-        user_id=current_user.id
+        **transaction.model_dump(),
+        user_id=user_id
     )
     
     db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
+    await commit_transactions_write(db, user_id)
+    await db.refresh(db_transaction)
     
-    # Форматируем ответ
-    response = schemas.TransactionResponse.from_orm(db_transaction)
+    # Форматируем ответ: поля категории уже выбраны при проверке выше
+    if category:
+        return transaction_response(db_transaction, category.name, category.icon)
     
-    if db_transaction.category:
-        response.category_name = db_transaction.category.name
-        response.category_icon = db_transaction.category.icon
+    return transaction_response(db_transaction)
+
+@router.get("/by-category")
+async def get_transactions_by_category(
+    request: Request,
+    response: Response,
+    start_date: Optional[datetime] = Query(None, description="Начальная дата"),
+    end_date: Optional[datetime] = Query(None, description="Конечная дата"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Получить транзакции по категориям.
     
-    return response
+    Объявлен раньше /{transaction_id}: иначе "by-category" разбирался бы как ID.
+    """
+    etag = await transactions_etag(db, request, user_id)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    
+    return await query_cache.get_or_set(
+        user_id,
+        etag,
+        lambda: compute_category_totals(db, user_id, start_date, end_date)
+    )
 
 @router.get("/{transaction_id}", response_model=schemas.TransactionResponse)
-def get_transaction(
+async def get_transaction(
     transaction_id: int = Path(..., description="ID транзакции"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Получить транзакцию по ID.
     """
-    transaction = db.query(models.Transaction).filter(
-        models.Transaction.id == transaction_id,
-        models.Transaction.user_id == current_user.id
-    ).first()
+    row = (await db.execute(
+        select_transactions().where(
+            models.Transaction.id == transaction_id,
+            models.Transaction.user_id == user_id
+        )
+    )).one_or_none()
     
-    if not transaction:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Транзакция с ID {transaction_id} не найдена"
         )
     
-    response = schemas.TransactionResponse.from_orm(transaction)
-    
-    if transaction.category:
-        response.category_name = transaction.category.name
-        response.category_icon = transaction.category.icon
-    
-    return response
+    return transaction_response(*row)
 
 @router.put("/{transaction_id}", response_model=schemas.TransactionResponse)
-def update_transaction(
+async def update_transaction(
     transaction_id: int = Path(..., description="ID транзакции"),
     transaction_update: schemas.TransactionUpdate = Depends(),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Обновить транзакцию.
+    
+    Переданные поля записываются одним UPDATE ... RETURNING, без предварительной
+    загрузки строки; незаданные (None) поля не меняются.
     """
-    # Находим транзакцию
-    transaction = db.query(models.Transaction).filter(
+    # Параметры формы приходят через Depends(): заданными считаются все поля,
+    # поэтому пропущенные отсекаются по None, а не по exclude_unset
+    update_data = transaction_update.model_dump(exclude_none=True)
+    conditions = [
         models.Transaction.id == transaction_id,
-        models.Transaction.user_id == current_user.id
-    ).first()
-    
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Транзакция с ID {transaction_id} не найдена"
-        )
+        models.Transaction.user_id == user_id
+    ]
+    category = None
     
-    # Проверяем категорию если указана
+    # Проверяем категорию если указана: нужны только тип, имя и иконка
     if transaction_update.category_id is not None:
-        category = db.query(models.Category).filter(
-            models.Category.id == transaction_update.category_id,
-            models.Category.user_id == current_user.id
-        ).first()
+        category = await find_category(db, transaction_update.category_id, user_id)
         
         if not category:
             raise HTTPException(
@@ -221,208 +580,162 @@ def update_transaction(
                 detail=f"Категория с ID {transaction_update.category_id} не найдена"
             )
         
-        # Проверяем соответствие типа
-        transaction_type = (
-            transaction_update.type.value 
-            if transaction_update.type 
-            else transaction.type
-        )
+        # Проверяем соответствие типа: новый тип известен сразу,
+        # а текущий тип транзакции проверяет сам UPDATE
+        if transaction_update.type:
+            if category.type != transaction_update.type.value:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Тип категории '{category.type}' "
+                        f"не соответствует типу транзакции '{transaction_update.type.value}'"
+                    )
+                )
+        else:
+            conditions.append(models.Transaction.type == category.type)
+    
+    if update_data:
+        transaction = (await db.execute(
+            update(models.Transaction).where(
+                *conditions
+            ).values(
+                **update_data
+            ).returning(
+                models.Transaction
+            ).execution_options(populate_existing=True)
+        )).scalar_one_or_none()
+    else:
+        transaction = (await db.execute(
+            select(models.Transaction).options(
+                *TRANSACTION_LOAD_OPTIONS
+            ).where(*conditions)
+        )).scalar_one_or_none()
+    
+    if not transaction:
+        # Ничего не обновлено: транзакции нет или её тип не подходит категории
+        transaction_type = (await db.execute(
+            select(models.Transaction.type).where(*conditions[:2])
+        )).scalar_one_or_none()
         
-        if category.type != transaction_type:
+        if transaction_type is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    f"Тип категории '{category.type}' "
-                    f"не соответствует типу транзакции '{transaction_type}'"
-                )
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Транзакция с ID {transaction_id} не найдена"
             )
+        
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Тип категории '{category.type}' "
+                f"не соответствует типу транзакции '{transaction_type}'"
+            )
+        )
     
-    # Обновляем поля
-    update_data = transaction_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(transaction, field, value)
-    
-    db.commit()
-    db.refresh(transaction)
+    await commit_transactions_write(db, user_id)
     
-    # Форматируем ответ
-    response = schemas.TransactionResponse.from_orm(transaction)
+    # Форматируем ответ: поля категории уже выбраны при проверке выше,
+    # иначе дочитываем их только для прежней категории транзакции
+    if category is None and transaction.category_id is not None:
+        category = await find_category(db, transaction.category_id, user_id)
     
-    if transaction.category:
-        response.category_name = transaction.category.name
-        response.category_icon = transaction.category.icon
+    if category:
+        return transaction_response(transaction, category.name, category.icon)
     
-    return response
+    return transaction_response(transaction)
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_transaction(
+async def delete_transaction(
     transaction_id: int = Path(..., description="ID транзакции"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Удалить транзакцию.
     """
-    transaction = db.query(models.Transaction).filter(
-        models.Transaction.id == transaction_id,
-        models.Transaction.user_id == current_user.id
-    ).first()
-    
-    if not transaction:
+    # Один DELETE ... RETURNING: проверка владельца и удаление за один запрос
+    deleted_id = (await db.execute(
+        delete(models.Transaction).where(
+            models.Transaction.id == transaction_id,
+            models.Transaction.user_id == user_id
+        ).returning(models.Transaction.id)
+    )).scalar_one_or_none()
+    
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Транзакция с ID {transaction_id} не найдена"
         )
     
-    db.delete(transaction)
-    db.commit()
+    await commit_transactions_write(db, user_id)
 
 @router.get("/stats/summary")
-def get_transaction_stats(
+async def get_transaction_stats(
+    request: Request,
+    response: Response,
     start_date: Optional[datetime] = Query(None, description="Начальная дата"),
     end_date: Optional[datetime] = Query(None, description="Конечная дата"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Получить статистику по транзакциям.
     """
-    # Запросы для статистики
-    income_query = db.query(func.sum(models.Transaction.amount)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.type == 'income'
-    )
-    
-    expense_query = db.query(func.sum(models.Transaction.amount)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.type == 'expense'
-    )
-    
-    count_query = db.query(func.count(models.Transaction.id)).filter(
-        models.Transaction.user_id == current_user.id
+    etag = await transactions_etag(db, request, user_id)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    
+    # Ключ — ETag: в нём версия данных пользователя, поэтому после любой записи
+    # (в том числе в другом воркере) ключ меняется и старое значение не отдаётся
+    return await query_cache.get_or_set(
+        user_id,
+        etag,
+        lambda: compute_transaction_stats(db, user_id, start_date, end_date)
     )
-    
-    # Применяем фильтры по дате
-    if start_date:
-        income_query = income_query.filter(models.Transaction.date >= start_date)
-        expense_query = expense_query.filter(models.Transaction.date >= start_date)
-        count_query = count_query.filter(models.Transaction.date >= start_date)
-    
-    if end_date:
-        income_query = income_query.filter(models.Transaction.date <= end_date)
-        expense_query = expense_query.filter(models.Transaction.date <= end_date)
-        count_query = count_query.filter(models.Transaction.date <= end_date)
-    
-    total_income = income_query.scalar() or Decimal('0')
-    total_expense = expense_query.scalar() or Decimal('0')
-    transaction_count = count_query.scalar() or 0
-    
-    # Рассчитываем среднее
-    total_amount = total_income + total_expense
-    average_transaction = (
-        total_amount / transaction_count 
-        if transaction_count > 0 
-        else Decimal('0')
-    )
-    
-    return {
-        "total_income": float(total_income),
-        "total_expense": float(total_expense),
-        "net_balance": float(total_income - total_expense),
-        "transaction_count": transaction_count,
-        "average_transaction": float(average_transaction),
-        "period": {
-            "start_date": start_date.isoformat() if start_date else None,
-            "end_date": end_date.isoformat() if end_date else None
-        }
-    }
 
 # ИСПРАВЛЕННЫЙ ЭНДПОИНТ: Используем Path для days в URL
 @router.get("/recent/{days}")
-def get_recent_transactions(
+async def get_recent_transactions(
+    request: Request,
+    response: Response,
     days: int = Path(..., ge=1, le=365, description="Количество дней"),
     limit: int = Query(50, ge=1, le=200, description="Лимит записей"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Получить последние транзакции за указанное количество дней.
+    
+    С заголовком Accept: application/x-ndjson транзакции отдаются потоком,
+    по одной на строку, без обёртки и счётчиков.
     """
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    transactions = db.query(models.Transaction).filter(
-        models.Transaction.user_id == current_user.id,
+    stmt = select_transactions().where(
+        models.Transaction.user_id == user_id,
         models.Transaction.date >= start_date
     ).order_by(
         desc(models.Transaction.date)
-    ).limit(limit).all()
+    ).limit(limit)
     
-    items = []
-    for transaction in transactions:
-        transaction_dict = schemas.TransactionResponse.from_orm(transaction)
-        
-        if transaction.category:
-            transaction_dict.category_name = transaction.category.name
-            transaction_dict.category_icon = transaction.category.icon
-        
-        items.append(transaction_dict)
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_transactions(stmt),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Vary": VARY_ACCEPT}
+        )
+    
+    response.headers["Vary"] = VARY_ACCEPT
+    rows = (await db.execute(stmt)).all()
+    
+    items = transaction_responses(rows)
     
     return {
         "transactions": items,
         "count": len(items),
         "days": days,
         "limit": limit
-    }
-
-@router.get("/by-category")
-def get_transactions_by_category(
-    start_date: Optional[datetime] = Query(None, description="Начальная дата"),
-    end_date: Optional[datetime] = Query(None, description="Конечная дата"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
-):
-    """
-    Получить транзакции по категориям.
-    """
-    query = db.query(
-        models.Category.name,
-        models.Category.icon,
-        models.Transaction.type,
-        func.sum(models.Transaction.amount).label('total'),
-        func.count(models.Transaction.id).label('count')
-    ).join(
-        models.Transaction,
-        models.Transaction.category_id == models.Category.id
-    ).filter(
-        models.Transaction.user_id == current_user.id
-    )
-    
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(models.Transaction.date <= end_date)
-    
-    results = query.group_by(
-        models.Category.name,
-        models.Category.icon,
-        models.Transaction.type
-    ).all()
-    
-    categories = []
-    for name, icon, type_, total, count in results:
-        categories.append({
-            "name": name,
-            "icon": icon,
-            "type": type_,
-            "total": float(total) if total else 0.0,
-            "count": count or 0
-        })
-    
-    return {
-        "categories": categories,
-        "count": len(categories),
-        "period": {
-            "start_date": start_date.isoformat() if start_date else None,
-            "end_date": end_date.isoformat() if end_date else None
-        }
     }
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/schemas/base.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Generic, TypeVar, List, Optional
 from datetime import datetime
 
@@ -9,8 +9,7 @@ class BaseResponse(BaseModel):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PaginationParams(BaseModel):
     skip: int = 0
@@ -1,19 +0,0 @@
-from .transaction import (
-    TransactionBase,
-    TransactionCreate,
-    TransactionUpdate,
-    TransactionResponse,
-    TransactionType,
-    PaginatedTransactions,
-    TransactionStats
-)
-
-__all__ = [
-    "TransactionBase",
-    "TransactionCreate",
-    "TransactionUpdate",
-    "TransactionResponse",
-    "TransactionType",
-    "PaginatedTransactions",
-    "TransactionStats"
-]
\ No newline at end of file
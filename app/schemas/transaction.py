@@ -1,5 +1,5 @@
 # app/schemas/transaction.py
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
@@ -18,13 +18,15 @@ class TransactionBase(BaseModel):
     type: TransactionType = Field(..., description="Тип транзакции: income или expense")
     category_id: Optional[int] = Field(None, description="ID категории")
 
-    @validator('amount')
+    @field_validator('amount')
+    @classmethod
     def validate_amount(cls, v):
         if v <= 0:
             raise ValueError('Сумма должна быть больше 0')
         return v
 
-    @validator('description')
+    @field_validator('description')
+    @classmethod
     def validate_description(cls, v):
         if v is not None and len(v.strip()) == 0:
             return None
@@ -46,8 +48,7 @@ class TransactionResponse(BaseResponse, TransactionBase):
     category_icon: Optional[str] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Для фильтрации
 class TransactionFilter(BaseModel):
@@ -60,7 +61,11 @@ class TransactionFilter(BaseModel):
 
 # Для пагинации
 class PaginatedTransactions(PaginatedResponse[TransactionResponse]):
+    # При листании курсором номер страницы не определён
+    page: Optional[int] = None
     summary: dict = {}
+    # Курсор для следующей страницы (None — страница последняя)
+    next_cursor: Optional[str] = None
 
 # Статистика
 class TransactionStats(BaseModel):
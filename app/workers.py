@@ -0,0 +1,11 @@
+# app/workers.py
+from uvicorn.workers import UvicornWorker
+
+class UvloopWorker(UvicornWorker):
+    """
+    Воркер gunicorn с циклом uvloop и парсером HTTP httptools.
+    
+    Стандартный UvicornWorker выбирает их в режиме "auto" и молча откатывается
+    на asyncio/h11, если пакетов нет; здесь воркер без них просто не стартует.
+    """
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
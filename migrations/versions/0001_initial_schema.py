@@ -0,0 +1,78 @@
+"""Начальная схема: users, categories, transactions
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Базы, созданные раньше через create_all, уже содержат эти таблицы:
+    # просто помечаем ревизию применённой
+    if sa.inspect(op.get_bind()).has_table('users'):
+        return
+    
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    
+    op.create_table(
+        'categories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('type', sa.Enum('income', 'expense', name='category_type'), nullable=False),
+        sa.Column('icon', sa.String(length=50), nullable=True),
+        sa.Column('color', sa.String(length=7), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='unique_user_category')
+    )
+    op.create_index('ix_categories_id', 'categories', ['id'])
+    op.create_index('ix_categories_user_type', 'categories', ['user_id', 'type'])
+    
+    op.create_table(
+        'transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('type', sa.Enum('income', 'expense', name='transaction_type'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint('amount > 0', name='check_amount_positive'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_id', 'transactions', ['id'])
+    op.create_index('ix_transactions_date', 'transactions', ['date'])
+    op.create_index('ix_transactions_user_date', 'transactions', ['user_id', 'date'])
+    op.create_index('ix_transactions_category_date', 'transactions', ['category_id', 'date'])
+
+def downgrade() -> None:
+    op.drop_table('transactions')
+    op.drop_table('categories')
+    op.drop_table('users')
+    
+    sa.Enum(name='transaction_type').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='category_type').drop(op.get_bind(), checkfirst=True)
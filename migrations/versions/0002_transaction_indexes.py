@@ -0,0 +1,30 @@
+"""Составные индексы транзакций
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+NEW_INDEXES = {
+    'ix_transactions_user_type_date': ['user_id', 'type', 'date'],
+    'ix_transactions_user_category': ['user_id', 'category_id'],
+}
+
+def upgrade() -> None:
+    # Пропускаем то, что уже создал create_all в более новых версиях приложения
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('transactions')}
+    
+    for name, index_columns in NEW_INDEXES.items():
+        if name not in indexes:
+            op.create_index(name, 'transactions', index_columns)
+
+def downgrade() -> None:
+    for name in NEW_INDEXES:
+        op.drop_index(name, table_name='transactions')
@@ -0,0 +1,26 @@
+"""Индекс (user_id, date, id) вместо (user_id, date)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('transactions')}
+    
+    # Новый индекс покрывает и все запросы старого (общий префикс user_id, date)
+    if 'ix_transactions_user_date_id' not in indexes:
+        op.create_index('ix_transactions_user_date_id', 'transactions', ['user_id', 'date', 'id'])
+    if 'ix_transactions_user_date' in indexes:
+        op.drop_index('ix_transactions_user_date', table_name='transactions')
+
+def downgrade() -> None:
+    op.create_index('ix_transactions_user_date', 'transactions', ['user_id', 'date'])
+    op.drop_index('ix_transactions_user_date_id', table_name='transactions')
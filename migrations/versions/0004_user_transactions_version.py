@@ -0,0 +1,27 @@
+"""Счётчик версии транзакций пользователя (для ETag)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('users')}
+    
+    # Пропускаем то, что уже создал create_all в более новых версиях приложения
+    if 'transactions_version' not in columns:
+        op.add_column(
+            'users',
+            sa.Column('transactions_version', sa.Integer(), nullable=False, server_default='0')
+        )
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('transactions_version')